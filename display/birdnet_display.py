@@ -1,17 +1,29 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, render_template, url_for, send_file, request, jsonify
 from urllib.parse import urljoin
 from datetime import datetime, timedelta
 import os
 import random
 import socket
+import subprocess
+import threading
+import time
 import qrcode
+import qrcode.image.svg
 import io
+import gzip
 import json
 import sys
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
+from concurrent.futures import ThreadPoolExecutor
 
 # Import variables and functions from the new cache builder script
-from cache_builder import CACHE_DIRECTORY, SPECIES_FILE, load_species_from_file
+from cache_builder import CACHE_DIRECTORY, IMAGE_EXTENSIONS, SPECIES_FILE, load_species_from_file, species_folder_name_for
 
 # --- Constants and Configuration ---
 BASE_URL = "http://localhost:8080/"
@@ -24,6 +36,38 @@ PROXIES = {"http": None, "https": None}
 SERVER_PORT = 5000
 PINNED_SPECIES_FILE = "pinned_species.json"
 PINNED_DURATION_HOURS = 24
+BRIGHTNESS_PATH = "/sys/class/backlight/10-0045/brightness"
+# Write the backlight directly when we have permission, otherwise go through sudo
+BRIGHTNESS_DIRECT = os.access(BRIGHTNESS_PATH, os.W_OK)
+LOCAL_IP_TTL = 300  # Seconds before the cached local IP is looked up again
+SERVER_URL_TEMPLATE = "http://{}:8080"
+IMAGE_OK_TTL = 300  # Seconds to trust an image URL that returned 200
+IMAGE_FAIL_TTL = 30  # Seconds to remember an image URL that failed
+GZIP_MIN_SIZE = 500  # Don't bother compressing responses smaller than this
+BIRD_DATA_TTL = 2.0  # Seconds concurrent /, /data requests share one upstream fetch
+API_TIMEOUT = (2, 4)  # (connect, read) seconds for the detections API
+API_DOWN_COOLDOWN = 15  # Seconds to skip the API after a failed request
+
+# Make sure the template exists once at startup rather than on every page load
+os.makedirs('static', exist_ok=True)
+if not os.path.exists(os.path.join('static', 'index.html')):
+    with open(os.path.join('static', 'index.html'), 'w') as f:
+        f.write('<h1>Template file not found. Please create an index.html file.</h1>')
+
+# --- HTTP Session ---
+# One pooled session for all outbound requests so keep-alive connections to
+# BirdNET-Go and the microphone are reused instead of re-handshaking each poll.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.proxies.update(PROXIES)
+SESSION.trust_env = False
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                       max_retries=Retry(total=1, read=False, backoff_factor=0.1))
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Shared pool for the per-render image HEAD checks so they run concurrently
+IMG_CHECK_POOL = ThreadPoolExecutor(max_workers=4)
 
 # --- Flask App Initialization ---
 app = Flask(__name__, template_folder='static')
@@ -31,33 +75,72 @@ app = Flask(__name__, template_folder='static')
 # --- Caching & Status Globals ---
 DETECTION_CACHE = { "id": None, "raw_data": [] }
 
+# --- JSON Helpers ---
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent=False):
+    """Serialize an object to UTF-8 JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def json_response(obj):
+    """Build a JSON response without going through Flask's stdlib encoder."""
+    return app.response_class(json_dumps(obj), mimetype='application/json')
+
 # --- Pinned Species Management ---
+# Parsed pinned-species file, reused until the file's mtime changes
+_PINNED_CACHE = {'mtime': None, 'data': {}}
+
 def load_pinned_species():
-    """Load pinned species from JSON file."""
-    if not os.path.exists(PINNED_SPECIES_FILE):
-        return {}
+    """Load pinned species from JSON file (cached until the file changes)."""
     try:
-        with open(PINNED_SPECIES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (IOError, json.JSONDecodeError) as e:
-        print(f"Error loading pinned species file: {e}")
+        mtime = os.stat(PINNED_SPECIES_FILE).st_mtime_ns
+    except OSError:
         return {}
+    if mtime != _PINNED_CACHE['mtime']:
+        try:
+            with open(PINNED_SPECIES_FILE, 'rb') as f:
+                data = json_loads(f.read())
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading pinned species file: {e}")
+            return {}
+        _PINNED_CACHE.update(mtime=mtime, data=data)
+    # Callers mutate the result before saving, so hand out a copy
+    return {name: dict(entry) for name, entry in _PINNED_CACHE['data'].items()}
 
 def save_pinned_species(pinned_data):
     """Save pinned species to JSON file."""
+    tmp_path = PINNED_SPECIES_FILE + '.tmp'
     try:
-        with open(PINNED_SPECIES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(pinned_data, f, indent=2)
+        with open(tmp_path, 'wb') as f:
+            f.write(json_dumps(pinned_data, indent=True))
+        os.replace(tmp_path, PINNED_SPECIES_FILE)
+        _PINNED_CACHE.update(mtime=os.stat(PINNED_SPECIES_FILE).st_mtime_ns,
+                             data={name: dict(entry) for name, entry in pinned_data.items()})
     except IOError as e:
         print(f"Error saving pinned species file: {e}")
 
+def pinned_until_ts(data):
+    """Epoch expiry of a pinned entry; parses the ISO string only for older entries."""
+    ts = data.get('pinned_until_ts')
+    if ts is None:
+        ts = datetime.fromisoformat(data['pinned_until']).timestamp()
+    return ts
+
 def add_pinned_species(species_name):
     """Add a species to the pinned list with 24-hour expiration."""
     pinned = load_pinned_species()
     # Only add if not already present (dismissed or not)
     if species_name not in pinned:
+        expiry = datetime.now() + timedelta(hours=PINNED_DURATION_HOURS)
         pinned[species_name] = {
-            'pinned_until': (datetime.now() + timedelta(hours=PINNED_DURATION_HOURS)).isoformat(),
+            'pinned_until': expiry.isoformat(),
+            'pinned_until_ts': expiry.timestamp(),
             'dismissed': False
         }
         save_pinned_species(pinned)
@@ -75,23 +158,31 @@ def get_active_pinned_species():
     """Get list of currently active (not expired, not dismissed) pinned species."""
     pinned = load_pinned_species()
     active = {}
-    now = datetime.now()
+    now_ts = time.time()
+    expired = False
 
     for species_name, data in list(pinned.items()):
-        pinned_until = datetime.fromisoformat(data['pinned_until'])
-        if not data.get('dismissed', False) and now < pinned_until:
+        expiry_ts = pinned_until_ts(data)
+        if not data.get('dismissed', False) and now_ts < expiry_ts:
             active[species_name] = data
-        elif now >= pinned_until:
+        elif now_ts >= expiry_ts:
             # Clean up expired entries
             del pinned[species_name]
+            expired = True
 
-    if len(pinned) != len(active):
+    # Only rewrite the file when something actually expired
+    if expired:
         save_pinned_species(pinned)
 
     return active
 
 # --- IP and QR Code Helpers ---
+_IP_CACHE = {'ip': None, 'ts': 0.0}
+
 def get_local_ip():
+    now = time.monotonic()
+    if _IP_CACHE['ip'] and now - _IP_CACHE['ts'] < LOCAL_IP_TTL:
+        return _IP_CACHE['ip']
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         s.connect(('10.255.255.255', 1))
@@ -100,25 +191,33 @@ def get_local_ip():
         IP = '127.0.0.1'
     finally:
         s.close()
+    _IP_CACHE.update(ip=IP, ts=now)
     return IP
 
-@app.route('/qr_code.png')
+# Encoded QR image, regenerated only when the local IP changes
+_QR_CACHE = {'ip': None, 'bytes': None}
+
+@app.route('/qr_code.svg')
 def qr_code():
     ip = get_local_ip()
-    url = f"http://{ip}:8080"
-    img = qrcode.make(url)
-    buf = io.BytesIO()
-    img.save(buf)
-    buf.seek(0)
-    return send_file(buf, mimetype='image/png')
+    if _QR_CACHE['ip'] != ip:
+        url = SERVER_URL_TEMPLATE.format(ip)
+        # Pure-Python SVG output; no PIL rasterizing/PNG encoding needed
+        img = qrcode.make(url, image_factory=qrcode.image.svg.SvgPathFillImage)
+        buf = io.BytesIO()
+        img.save(buf)
+        _QR_CACHE.update(ip=ip, bytes=buf.getvalue())
+    response = send_file(io.BytesIO(_QR_CACHE['bytes']), mimetype='image/svg+xml')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
 
 # --- Time Helper Functions ---
-def parse_absolute_time_to_seconds_ago(time_str):
+def parse_absolute_time_to_seconds_ago(time_str, now=None):
     if not time_str: return 0
     try:
-        time_format = "%Y-%m-%d %H:%M:%S"
-        detection_time = datetime.strptime(time_str, time_format)
-        time_difference = datetime.now() - detection_time
+        # "YYYY-MM-DD HH:MM:SS" is ISO 8601 with a space separator; fromisoformat is C-backed
+        detection_time = datetime.fromisoformat(time_str)
+        time_difference = (now or datetime.now()) - detection_time
         return max(0, time_difference.total_seconds())
     except (ValueError, TypeError):
         return 0
@@ -132,13 +231,25 @@ def format_seconds_ago(total_seconds):
     return f"{int(hours / 24)}d ago"
 
 # --- Data Parsing and API Helpers ---
+# Recent image URL check results: url -> (ok, expiry)
+_URL_CHECKS = {}
+
 def check_image_url_fast(url):
-    """Quick check if an image URL is accessible with very short timeout."""
+    """Quick check if an image URL is accessible, remembering recent results."""
+    now = time.monotonic()
+    cached = _URL_CHECKS.get(url)
+    if cached and cached[1] > now:
+        return cached[0]
     try:
-        response = requests.head(url, timeout=0.5)
-        return response.status_code == 200
+        response = SESSION.head(url, timeout=0.5)
+        ok = response.status_code == 200
     except requests.exceptions.RequestException:
-        return False
+        ok = False
+    if len(_URL_CHECKS) > 512:
+        for key, (_, expiry) in list(_URL_CHECKS.items()):
+            if expiry <= now: _URL_CHECKS.pop(key, None)
+    _URL_CHECKS[url] = (ok, now + (IMAGE_OK_TTL if ok else IMAGE_FAIL_TTL))
+    return ok
 
 def parse_v2_detection_item(detection, server_ip):
     try:
@@ -158,24 +269,74 @@ def parse_v2_detection_item(detection, server_ip):
         return None
 
 # --- Core Data Fetching Logic ---
+# Per-species directory listings: species_dir -> (mtime_ns, images, attribution paths)
+_SPECIES_LISTING = {}
+
+def _list_species_dir(species_dir):
+    """Return (images, {stem: attribution_path}) for a species folder, cached by mtime."""
+    try:
+        mtime = os.stat(species_dir).st_mtime_ns
+    except OSError:
+        _SPECIES_LISTING.pop(species_dir, None)
+        return None
+    cached = _SPECIES_LISTING.get(species_dir)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    images = []
+    attrs = {}
+    with os.scandir(species_dir) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False): continue
+            name = entry.name
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                images.append(name)
+            elif name.endswith('.txt'):
+                attrs[name[:-4]] = entry.path
+    images.sort()
+    _SPECIES_LISTING[species_dir] = (mtime, images, attrs)
+    return images, attrs
+
+# URL prefix for cached images, resolved through url_for on first use
+_CACHE_BASENAME = os.path.basename(CACHE_DIRECTORY)
+_CACHE_URL_PREFIX = None
+
+def _cache_url_prefix():
+    global _CACHE_URL_PREFIX
+    if _CACHE_URL_PREFIX is None:
+        _CACHE_URL_PREFIX = f"{url_for('static', filename='')}{_CACHE_BASENAME}/"
+    return _CACHE_URL_PREFIX
+
 def get_cached_image(species_name):
-    species_folder_name = "".join(c for c in species_name if c.isalnum() or c in ' _').rstrip().replace(' ', '_')
+    species_folder_name = species_folder_name_for(species_name)
     species_dir = os.path.join(CACHE_DIRECTORY, species_folder_name)
-    if os.path.isdir(species_dir):
-        images = sorted([f for f in os.listdir(species_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
+    listing = _list_species_dir(species_dir)
+    if listing:
+        images, attrs = listing
         if not images: return None
         chosen_image = random.choice(images)
-        attr_path = os.path.join(species_dir, f"{os.path.splitext(chosen_image)[0]}.txt")
+        attr_path = attrs.get(os.path.splitext(chosen_image)[0])
         copyright_info = ""
-        if os.path.exists(attr_path):
+        if attr_path:
             with open(attr_path, 'r', encoding='utf-8') as f: copyright_info = f.read().strip()
-        image_url = url_for('static', filename=os.path.join(os.path.basename(CACHE_DIRECTORY), species_folder_name, chosen_image).replace('\\', '/'))
+        image_url = f"{_cache_url_prefix()}{species_folder_name}/{chosen_image}"
         return {"image_url": image_url, "copyright": copyright_info}
     return None
 
+_SPECIES_CACHE = {'mtime': None, 'list': ()}
+
+def _species_list():
+    """Return the species list from SPECIES_FILE, re-reading only when it changes."""
+    try:
+        mtime = os.stat(SPECIES_FILE).st_mtime_ns
+    except OSError:
+        return ()
+    if mtime != _SPECIES_CACHE['mtime']:
+        _SPECIES_CACHE.update(mtime=mtime, list=tuple(load_species_from_file(SPECIES_FILE)))
+    return _SPECIES_CACHE['list']
+
 def get_offline_fallback_data():
     print("[INFO] Loading data from local cache.")
-    species_list = load_species_from_file(SPECIES_FILE)
+    species_list = _species_list()
     if not species_list: return []
     fallback_data = []
     num_to_sample = min(len(species_list), 4)
@@ -190,17 +351,24 @@ def get_offline_fallback_data():
             })
     return fallback_data
 
+# Circuit breaker: while the API is known to be down, go straight to offline data
+_API_STATE = {'down_until': 0.0}
+
 def get_bird_data():
+    if time.monotonic() < _API_STATE['down_until']:
+        return get_offline_fallback_data(), True
     server_ip = get_local_ip()
     api_url = urljoin(BASE_URL, API_ENDPOINT)
-    params = {'limit': 50}
+    # Only 4 birds are shown; 20 leaves headroom for duplicates and pinned species
+    params = {'limit': 20}
     try:
-        response = requests.get(api_url, headers=HEADERS, proxies=PROXIES, timeout=10, params=params)
+        response = SESSION.get(api_url, timeout=API_TIMEOUT, params=params)
         response.raise_for_status()
-        detections = response.json()
+        _API_STATE['down_until'] = 0.0
+        detections = json_loads(response.content)
         if not isinstance(detections, list) or not detections:
             return get_offline_fallback_data(), True
-        all_parsed = [d for d in [parse_v2_detection_item(item, server_ip) for item in detections] if d]
+        all_parsed = [d for d in (parse_v2_detection_item(item, server_ip) for item in detections) if d]
         if not all_parsed:
             return get_offline_fallback_data(), True
 
@@ -212,41 +380,37 @@ def get_bird_data():
         # Get currently active pinned species
         active_pinned = get_active_pinned_species()
 
-        # Separate pinned and unpinned birds
+        # Separate pinned and unpinned birds, deduplicating by name in one pass
         pinned_birds = []
         unpinned_birds = []
+        seen_names = set()
 
         for bird in all_parsed:
-            if bird['name'] in active_pinned:
+            name = bird['name']
+            if name in seen_names:
+                continue
+            seen_names.add(name)
+            if name in active_pinned:
                 bird['is_pinned'] = True
-                if bird['name'] not in [b['name'] for b in pinned_birds]:
-                    pinned_birds.append(bird)
+                pinned_birds.append(bird)
             else:
                 bird['is_pinned'] = False
                 unpinned_birds.append(bird)
-
-        # Get unique unpinned species (deduplicate by name)
-        unique_unpinned = []
-        seen_names = set()
-        for bird in unpinned_birds:
-            if bird['name'] not in seen_names:
-                unique_unpinned.append(bird)
-                seen_names.add(bird['name'])
+            # Stop once the display is full and no later pinned bird could displace anything
+            if len(pinned_birds) >= 4 or (
+                    len(pinned_birds) == len(active_pinned) and len(pinned_birds) + len(unpinned_birds) >= 4):
+                break
 
         # Combine: pinned first, then unpinned, limit to 4
-        final_list = pinned_birds + unique_unpinned
+        final_list = pinned_birds + unpinned_birds
         final_list = final_list[:4]
 
-        # Check image URLs for only these final 4 birds
-        for bird in final_list:
-            if bird.get('image_url'):
-                if not check_image_url_fast(bird['image_url']):
-                    cached_asset = get_cached_image(bird['name'])
-                    if cached_asset:
-                        bird['image_url'] = cached_asset['image_url']
-                        bird['copyright'] = cached_asset['copyright']
-            else:
-                # No image URL, use cache
+        # Check image URLs for only these final 4 birds, concurrently
+        image_ok = IMG_CHECK_POOL.map(
+            lambda b: bool(b.get('image_url')) and check_image_url_fast(b['image_url']), final_list)
+        for bird, ok in zip(final_list, image_ok):
+            if not ok:
+                # Missing or unreachable image URL, use cache
                 cached_asset = get_cached_image(bird['name'])
                 if cached_asset:
                     bird['image_url'] = cached_asset['image_url']
@@ -261,29 +425,65 @@ def get_bird_data():
             DETECTION_CACHE["id"] = new_id
             data_to_process = final_list
 
-        display_data = []
-        for bird in data_to_process:
-            bird_display_copy = bird.copy()
-            bird_display_copy['time_display'] = format_seconds_ago(parse_absolute_time_to_seconds_ago(bird['time_raw']))
-            bird_display_copy['confidence'] = f"{bird['confidence_value']}%"
-            display_data.append(bird_display_copy)
+        # Project only the fields the display uses rather than copying each bird
+        now = datetime.now()
+        display_data = [{
+            "name": bird['name'],
+            "time_display": format_seconds_ago(parse_absolute_time_to_seconds_ago(bird['time_raw'], now)),
+            "confidence": f"{bird['confidence_value']}%", "confidence_value": bird['confidence_value'],
+            "image_url": bird['image_url'], "copyright": bird['copyright'], "is_pinned": bird['is_pinned']
+        } for bird in data_to_process]
 
         return display_data, False
-    except requests.exceptions.RequestException:
+    except (requests.exceptions.RequestException, ValueError):
         print("[INFO] BirdNET-Go API unavailable, using offline mode")
+        _API_STATE['down_until'] = time.monotonic() + API_DOWN_COOLDOWN
         return get_offline_fallback_data(), True
 
+_BIRD_CACHE = {'ts': 0.0, 'val': None}
+_BIRD_CACHE_LOCK = threading.Lock()
+
+def get_bird_data_cached():
+    """Return get_bird_data(), coalescing calls made within BIRD_DATA_TTL seconds."""
+    val = _BIRD_CACHE['val']
+    if val is not None and time.monotonic() - _BIRD_CACHE['ts'] < BIRD_DATA_TTL:
+        return val
+    with _BIRD_CACHE_LOCK:
+        # Another request may have refreshed the cache while we waited
+        val = _BIRD_CACHE['val']
+        if val is not None and time.monotonic() - _BIRD_CACHE['ts'] < BIRD_DATA_TTL:
+            return val
+        val = get_bird_data()
+        _BIRD_CACHE.update(ts=time.monotonic(), val=val)
+        return val
+
+# --- Response Compression ---
+@app.after_request
+def gzip_response(response):
+    """Gzip JSON and HTML responses for clients that accept it."""
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in ('application/json', 'text/html')
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
 # --- Flask Routes ---
 @app.route('/')
 def index():
-    bird_data, api_is_down = get_bird_data()
-    if not os.path.exists('static'): os.makedirs('static')
+    bird_data, api_is_down = get_bird_data_cached()
     template_path = 'index.html'
-    if not os.path.exists(os.path.join('static', template_path)):
-         with open(os.path.join('static', template_path), 'w') as f:
-              f.write('<h1>Template file not found. Please create an index.html file.</h1>')
     refresh_interval = 30 if api_is_down else 5
-    server_url = f"http://{get_local_ip()}:8080"
+    server_url = SERVER_URL_TEMPLATE.format(get_local_ip())
     return render_template(
         template_path, birds=bird_data, refresh_interval=refresh_interval, 
         api_is_down=api_is_down, server_url=server_url
@@ -291,21 +491,25 @@ def index():
 
 @app.route('/data')
 def data():
-    bird_data, api_is_down = get_bird_data()
-    return jsonify({'birds': bird_data, 'api_is_down': api_is_down})
+    bird_data, api_is_down = get_bird_data_cached()
+    response = json_response({'birds': bird_data, 'api_is_down': api_is_down})
+    # Let the 5s poll revalidate and get a 304 when nothing on screen changed
+    response.headers['Cache-Control'] = 'no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
 
 @app.route('/audio_status')
 def audio_status():
     try:
         status_url = "http://10.42.0.50/api/status"
-        response = requests.get(status_url, timeout=5)
+        response = SESSION.get(status_url, timeout=5)
         response.raise_for_status()
-        status_data = response.json()
+        status_data = json_loads(response.content)
         is_connected = status_data.get("streaming") is True
-    except (requests.exceptions.RequestException, json.JSONDecodeError, KeyError):
+    except (requests.exceptions.RequestException, ValueError, KeyError):
         print("[INFO] Microphone status unavailable")
         is_connected = False
-    return jsonify({"connected": is_connected})
+    return json_response({"connected": is_connected})
 
 @app.route('/shutdown', methods=['POST'])
 def shutdown():
@@ -322,10 +526,17 @@ def shutdown():
 def set_brightness():
     try:
         brightness = request.json.get('brightness')
-        if brightness is not None and 0 <= int(brightness) <= 255:
-            command = f"echo {brightness} | sudo tee /sys/class/backlight/10-0045/brightness"
-            print(f"Executing brightness command: {command}")
-            os.system(command)
+        try:
+            value = int(brightness)
+        except (TypeError, ValueError):
+            value = None
+        if value is not None and 0 <= value <= 255:
+            print(f"Setting brightness to {value}")
+            if BRIGHTNESS_DIRECT:
+                with open(BRIGHTNESS_PATH, 'w') as f: f.write(str(value))
+            else:
+                subprocess.run(['sudo', 'tee', BRIGHTNESS_PATH], input=f"{value}\n", text=True,
+                               stdout=subprocess.DEVNULL, check=False)
             return jsonify({'status': 'success', 'brightness': brightness})
         return jsonify({'status': 'error', 'message': 'Invalid brightness value'}), 400
     except Exception as e:
@@ -348,13 +559,11 @@ def poweroff_system():
 def get_pinned_species():
     """Return list of currently pinned species with time remaining."""
     active_pinned = get_active_pinned_species()
-    now = datetime.now()
+    now_ts = time.time()
     result = []
 
     for species_name, data in active_pinned.items():
-        pinned_until = datetime.fromisoformat(data['pinned_until'])
-        time_remaining = pinned_until - now
-        hours_remaining = int(time_remaining.total_seconds() / 3600)
+        hours_remaining = int((pinned_until_ts(data) - now_ts) / 3600)
 
         result.append({
             'name': species_name,
@@ -362,7 +571,7 @@ def get_pinned_species():
             'pinned_until': data['pinned_until']
         })
 
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/dismiss_pinned/<species_name>', methods=['POST'])
 def dismiss_pinned(species_name):
@@ -393,4 +602,10 @@ if __name__ == '__main__':
         sys.exit()
     
     print(f"Starting Flask server on http://0.0.0.0:{SERVER_PORT}")
-    app.run(host='0.0.0.0', port=SERVER_PORT)
\ No newline at end of file
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug's dev server, but at least handle requests concurrently
+        app.run(host='0.0.0.0', port=SERVER_PORT, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=SERVER_PORT, threads=8)
\ No newline at end of file
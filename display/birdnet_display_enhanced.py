@@ -1,19 +1,37 @@
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, render_template, url_for, send_file, request, jsonify
 from urllib.parse import urljoin
 from datetime import datetime, timedelta
 import os
 import random
 import socket
+import threading
+import time
 import qrcode
+import qrcode.image.svg
 import io
 import json
 import sys
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson isn't installed
+    orjson = None
 import yaml
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+import copy
 import subprocess
+try:
+    from pystemd.systemd1 import Manager as SystemdManager
+except ImportError:  # pystemd is optional; restart_service falls back to sudo systemctl
+    SystemdManager = None
+from concurrent.futures import ThreadPoolExecutor
 
 # Import variables and functions from the new cache builder script
-from cache_builder import CACHE_DIRECTORY, SPECIES_FILE, load_species_from_file
+from cache_builder import CACHE_DIRECTORY, IMAGE_EXTENSIONS, SPECIES_FILE, load_species_from_file, species_folder_name_for
 
 # --- Constants and Configuration ---
 BASE_URL = "http://localhost:8080/"
@@ -26,28 +44,121 @@ PROXIES = {"http": None, "https": None}
 SERVER_PORT = 5000
 PINNED_SPECIES_FILE = "pinned_species.json"
 PINNED_DURATION_HOURS = 24
+BRIGHTNESS_PATH = "/sys/class/backlight/10-0045/brightness"
+# Write the backlight directly when we have permission, otherwise go through sudo
+BRIGHTNESS_DIRECT = os.access(BRIGHTNESS_PATH, os.W_OK)
+LOCAL_IP_TTL = 300  # Seconds before the cached local IP is looked up again
+SERVER_URL_TEMPLATE = "http://{}:8080"
+AUDIO_STATUS_TTL = 2.0  # Seconds to reuse the last microphone status probe
+AUDIO_STATUS_TIMEOUT = (1.0, 1.5)  # (connect, read) seconds for the microphone probe
 
 # Configuration file paths
 BIRDNET_CONFIG_PATH = "/root/birdnet-go-app/config/config.yaml"
 MEDIAMTX_CONFIG_PATH = "/etc/mediamtx.yml"
 DISPLAY_CONFIG_FILE = "display_config.json"
+YAML_SIDECAR_SUFFIX = ".jsoncache"  # JSON copy of a parsed YAML config, reused across restarts
+
+# --- HTTP Session ---
+# One pooled keep-alive session for the detections API, thumbnail checks and microphone probe
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.proxies.update(PROXIES)
+SESSION.trust_env = False
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Shared pool for the per-render image HEAD checks so they run concurrently
+IMG_CHECK_POOL = ThreadPoolExecutor(max_workers=4)
 
 # --- Flask App Initialization ---
 app = Flask(__name__, template_folder='static')
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
+
+# Cached bird images never change once downloaded, so let the browser keep them
+CACHED_IMAGE_URL_PREFIX = f"{app.static_url_path}/{os.path.basename(CACHE_DIRECTORY)}/"
+
+@app.after_request
+def cache_bird_images(response):
+    if response.mimetype.startswith('image/') and request.path.startswith(CACHED_IMAGE_URL_PREFIX):
+        response.headers['Cache-Control'] = 'public, max-age=604800, immutable'
+    return response
+
+# --- JSON Helpers ---
+def json_dumps(obj):
+    """Serialize an object to UTF-8 JSON bytes, using orjson when available."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def json_response(obj):
+    """Build a JSON response without going through Flask's stdlib encoder."""
+    return json_body_response(json_dumps(obj))
+
+def json_body_response(body):
+    """Build a JSON response from already-serialized bytes."""
+    return app.response_class(body, mimetype='application/json')
 
 # --- Configuration Management ---
+# Parsed config files: path -> ((st_mtime_ns, st_size), parsed data)
+_CONFIG_CACHE = {}
+
+def _load_cached(path, parse):
+    """Parse a config file, reusing the last result while its mtime and size are unchanged."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, parse(path))
+        _CONFIG_CACHE[path] = cached
+    # Callers modify the loaded config before saving, so never hand out the cached object
+    return copy.deepcopy(cached[1])
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_yaml_sidecar(path, data):
+    """Write a JSON copy of parsed YAML next to it so later loads can skip YAML parsing."""
+    sidecar_path = path + YAML_SIDECAR_SUFFIX
+    try:
+        # Skip configs that don't survive a JSON round trip (non-string keys, dates, ...)
+        if json.loads(json.dumps(data)) != data:
+            return
+        tmp_path = sidecar_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, sidecar_path)
+    except (TypeError, ValueError, OSError):
+        pass  # The sidecar is only an optimization
+
+def _read_yaml(path):
+    """Parse a YAML file, preferring its JSON sidecar when that is newer than the YAML."""
+    sidecar_path = path + YAML_SIDECAR_SUFFIX
+    try:
+        if os.stat(sidecar_path).st_mtime_ns > os.stat(path).st_mtime_ns:
+            return _read_json(sidecar_path)
+    except (OSError, ValueError):
+        pass
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    _write_yaml_sidecar(path, data)
+    return data
+
+# Serialized GET /api/config/display body, tied to the parsed config's cache key
+_DISPLAY_CONFIG_JSON = {'key': None, 'body': None}
+
 def load_display_config():
     """Load display-specific configuration (cached settings)"""
-    if not os.path.exists(DISPLAY_CONFIG_FILE):
+    try:
+        return _load_cached(DISPLAY_CONFIG_FILE, _read_json)
+    except FileNotFoundError:
         return {
             'birdnet_server_url': 'http://localhost:8080',
             'esp32_ip': '192.168.1.211',
             'esp32_port': '8080',
             'microphone_status_url': 'http://10.42.0.50/api/status'
         }
-    try:
-        with open(DISPLAY_CONFIG_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Error loading display config: {e}")
         return {}
@@ -57,6 +168,9 @@ def save_display_config(config):
     try:
         with open(DISPLAY_CONFIG_FILE, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2)
+        # Don't rely on the mtime changing for the parse and response caches
+        _CONFIG_CACHE.pop(DISPLAY_CONFIG_FILE, None)
+        _DISPLAY_CONFIG_JSON['key'] = None
         return True
     except IOError as e:
         print(f"Error saving display config: {e}")
@@ -64,11 +178,10 @@ def save_display_config(config):
 
 def load_birdnet_config():
     """Load BirdNET-Go configuration from YAML"""
-    if not os.path.exists(BIRDNET_CONFIG_PATH):
-        return None
     try:
-        with open(BIRDNET_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return _load_cached(BIRDNET_CONFIG_PATH, _read_yaml)
+    except FileNotFoundError:
+        return None
     except Exception as e:
         print(f"Error loading BirdNET config: {e}")
         return None
@@ -77,7 +190,8 @@ def save_birdnet_config(config):
     """Save BirdNET-Go configuration to YAML"""
     try:
         with open(BIRDNET_CONFIG_PATH, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+        _write_yaml_sidecar(BIRDNET_CONFIG_PATH, config)
         return True
     except Exception as e:
         print(f"Error saving BirdNET config: {e}")
@@ -85,11 +199,10 @@ def save_birdnet_config(config):
 
 def load_mediamtx_config():
     """Load MediaMTX configuration from YAML"""
-    if not os.path.exists(MEDIAMTX_CONFIG_PATH):
-        return None
     try:
-        with open(MEDIAMTX_CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return _load_cached(MEDIAMTX_CONFIG_PATH, _read_yaml)
+    except FileNotFoundError:
+        return None
     except Exception as e:
         print(f"Error loading MediaMTX config: {e}")
         return None
@@ -98,7 +211,8 @@ def save_mediamtx_config(config):
     """Save MediaMTX configuration to YAML"""
     try:
         with open(MEDIAMTX_CONFIG_PATH, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+        _write_yaml_sidecar(MEDIAMTX_CONFIG_PATH, config)
         return True
     except Exception as e:
         print(f"Error saving MediaMTX config: {e}")
@@ -106,6 +220,14 @@ def save_mediamtx_config(config):
 
 def restart_service(service_name):
     """Restart a systemd service"""
+    if SystemdManager is not None:
+        # Ask systemd over D-Bus directly; needs root or a polkit rule, so fall back on failure
+        try:
+            with SystemdManager() as manager:
+                manager.Manager.RestartUnit(service_name.encode(), b'replace')
+            return True, f"Service {service_name} restarted successfully"
+        except Exception as e:
+            print(f"D-Bus restart of {service_name} failed, falling back to systemctl: {e}")
     try:
         subprocess.run(['sudo', 'systemctl', 'restart', service_name],
                        check=True, capture_output=True, text=True)
@@ -114,22 +236,37 @@ def restart_service(service_name):
         return False, f"Failed to restart {service_name}: {e.stderr}"
 
 # --- Caching & Status Globals ---
-DETECTION_CACHE = { "id": None, "raw_data": [] }
+DETECTION_CACHE = { "id": None, "rendered": [] }
 
 # --- Pinned Species Management ---
-def load_pinned_species():
-    """Load pinned species from JSON file."""
+# Pinned species live in memory; the file is read once and only rewritten on changes
+_PINNED = {'data': None}
+_PINNED_LOCK = threading.Lock()
+
+def _read_pinned_file():
     if not os.path.exists(PINNED_SPECIES_FILE):
         return {}
     try:
         with open(PINNED_SPECIES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            pinned = json.load(f)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Error loading pinned species file: {e}")
         return {}
+    # Older files only have the ISO string; convert once so lookups compare floats
+    for data in pinned.values():
+        if 'pinned_until_ts' not in data:
+            data['pinned_until_ts'] = datetime.fromisoformat(data['pinned_until']).timestamp()
+    return pinned
+
+def load_pinned_species():
+    """Return the in-memory pinned species, loading the JSON file on first use."""
+    if _PINNED['data'] is None:
+        _PINNED['data'] = _read_pinned_file()
+    return _PINNED['data']
 
 def save_pinned_species(pinned_data):
     """Save pinned species to JSON file."""
+    _PINNED['data'] = pinned_data
     try:
         with open(PINNED_SPECIES_FILE, 'w', encoding='utf-8') as f:
             json.dump(pinned_data, f, indent=2)
@@ -138,72 +275,111 @@ def save_pinned_species(pinned_data):
 
 def add_pinned_species(species_name):
     """Add a species to the pinned list with 24-hour expiration."""
-    pinned = load_pinned_species()
-    # Only add if not already present (dismissed or not)
-    if species_name not in pinned:
-        pinned[species_name] = {
-            'pinned_until': (datetime.now() + timedelta(hours=PINNED_DURATION_HOURS)).isoformat(),
-            'dismissed': False
-        }
-        save_pinned_species(pinned)
+    with _PINNED_LOCK:
+        pinned = load_pinned_species()
+        # Only add if not already present (dismissed or not)
+        if species_name not in pinned:
+            expiry = datetime.now() + timedelta(hours=PINNED_DURATION_HOURS)
+            pinned[species_name] = {
+                'pinned_until': expiry.isoformat(),
+                'pinned_until_ts': expiry.timestamp(),
+                'dismissed': False
+            }
+            save_pinned_species(pinned)
 
 def dismiss_pinned_species(species_name):
     """Mark a pinned species as dismissed."""
-    pinned = load_pinned_species()
-    if species_name in pinned:
-        pinned[species_name]['dismissed'] = True
-        save_pinned_species(pinned)
-        return True
-    return False
+    with _PINNED_LOCK:
+        pinned = load_pinned_species()
+        if species_name in pinned:
+            pinned[species_name]['dismissed'] = True
+            save_pinned_species(pinned)
+            return True
+        return False
 
 def get_active_pinned_species():
     """Get list of currently active (not expired, not dismissed) pinned species."""
-    pinned = load_pinned_species()
-    active = {}
-    now = datetime.now()
+    with _PINNED_LOCK:
+        pinned = load_pinned_species()
+        active = {}
+        now_ts = time.time()
+        expired = False
 
-    for species_name, data in list(pinned.items()):
-        pinned_until = datetime.fromisoformat(data['pinned_until'])
-        if not data.get('dismissed', False) and now < pinned_until:
-            active[species_name] = data
-        elif now >= pinned_until:
-            # Clean up expired entries
-            del pinned[species_name]
+        for species_name, data in list(pinned.items()):
+            if not data.get('dismissed', False) and now_ts < data['pinned_until_ts']:
+                active[species_name] = data
+            elif now_ts >= data['pinned_until_ts']:
+                # Clean up expired entries
+                del pinned[species_name]
+                expired = True
 
-    if len(pinned) != len(active):
-        save_pinned_species(pinned)
+        # Only rewrite the file when something actually expired
+        if expired:
+            save_pinned_species(pinned)
 
-    return active
+        return active
 
 # --- IP and QR Code Helpers ---
+_IP_CACHE = {'ip': None, 'ts': 0.0}
+_IP_LOCK = threading.Lock()
+
 def get_local_ip():
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    try:
-        s.connect(('10.255.255.255', 1))
-        IP = s.getsockname()[0]
-    except Exception:
-        IP = '127.0.0.1'
-    finally:
-        s.close()
-    return IP
+    now = time.monotonic()
+    if _IP_CACHE['ip'] and now - _IP_CACHE['ts'] < LOCAL_IP_TTL:
+        return _IP_CACHE['ip']
+    with _IP_LOCK:
+        if _IP_CACHE['ip'] and now - _IP_CACHE['ts'] < LOCAL_IP_TTL:
+            return _IP_CACHE['ip']
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.connect(('10.255.255.255', 1))
+            IP = s.getsockname()[0]
+        except Exception:
+            IP = '127.0.0.1'
+        finally:
+            s.close()
+        _IP_CACHE.update(ip=IP, ts=now)
+        return IP
+
+# Encoded QR images, regenerated only when the local IP changes
+_QR_CACHE = {'ip': None, 'png': None, 'svg': None}
+
+def _qr_code_bytes(fmt):
+    ip = get_local_ip()
+    if ip != _QR_CACHE['ip']:
+        _QR_CACHE.update(ip=ip, png=None, svg=None)
+    if _QR_CACHE[fmt] is None:
+        url = SERVER_URL_TEMPLATE.format(ip)
+        # SVG is pure Python; PNG needs PIL to rasterize
+        img = qrcode.make(url, image_factory=qrcode.image.svg.SvgPathFillImage) if fmt == 'svg' else qrcode.make(url)
+        buf = io.BytesIO()
+        img.save(buf)
+        _QR_CACHE[fmt] = buf.getvalue()
+    return _QR_CACHE[fmt]
 
 @app.route('/qr_code.png')
 def qr_code():
-    ip = get_local_ip()
-    url = f"http://{ip}:8080"
-    img = qrcode.make(url)
-    buf = io.BytesIO()
-    img.save(buf)
-    buf.seek(0)
-    return send_file(buf, mimetype='image/png')
+    response = send_file(io.BytesIO(_qr_code_bytes('png')), mimetype='image/png')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+# The shared static/index.html asks for the SVG variant
+@app.route('/qr_code.svg')
+def qr_code_svg():
+    response = send_file(io.BytesIO(_qr_code_bytes('svg')), mimetype='image/svg+xml')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
 
 # --- Time Helper Functions ---
-def parse_absolute_time_to_seconds_ago(time_str):
+def parse_absolute_time_to_seconds_ago(time_str, now=None):
     if not time_str: return 0
     try:
-        time_format = "%Y-%m-%d %H:%M:%S"
-        detection_time = datetime.strptime(time_str, time_format)
-        time_difference = datetime.now() - detection_time
+        try:
+            # "YYYY-MM-DD HH:MM:SS" is ISO 8601 with a space separator; fromisoformat is C-backed
+            detection_time = datetime.fromisoformat(time_str)
+        except ValueError:
+            detection_time = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
+        time_difference = (now or datetime.now()) - detection_time
         return max(0, time_difference.total_seconds())
     except (ValueError, TypeError):
         return 0
@@ -220,7 +396,7 @@ def format_seconds_ago(total_seconds):
 def check_image_url_fast(url):
     """Quick check if an image URL is accessible with very short timeout."""
     try:
-        response = requests.head(url, timeout=0.5)
+        response = SESSION.head(url, timeout=0.5)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
@@ -243,24 +419,65 @@ def parse_v2_detection_item(detection, server_ip):
         return None
 
 # --- Core Data Fetching Logic ---
+# Per-species directory listings: species_dir -> (mtime_ns, images, attribution paths)
+_SPECIES_DIR_CACHE = {}
+
+def _list_species_dir(species_dir):
+    """Return (images, {stem: attribution_path}) for a species folder, cached by mtime.
+
+    Images are left in directory order; get_cached_image picks one at random anyway.
+    """
+    try:
+        mtime = os.stat(species_dir).st_mtime_ns
+    except OSError:
+        _SPECIES_DIR_CACHE.pop(species_dir, None)
+        return None
+    cached = _SPECIES_DIR_CACHE.get(species_dir)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    images = []
+    attrs = {}
+    with os.scandir(species_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                images.append(name)
+            elif name.endswith('.txt'):
+                attrs[name[:-4]] = entry.path
+    _SPECIES_DIR_CACHE[species_dir] = (mtime, images, attrs)
+    return images, attrs
+
 def get_cached_image(species_name):
-    species_folder_name = "".join(c for c in species_name if c.isalnum() or c in ' _').rstrip().replace(' ', '_')
+    species_folder_name = species_folder_name_for(species_name)
     species_dir = os.path.join(CACHE_DIRECTORY, species_folder_name)
-    if os.path.isdir(species_dir):
-        images = sorted([f for f in os.listdir(species_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
+    listing = _list_species_dir(species_dir)
+    if listing:
+        images, attrs = listing
         if not images: return None
         chosen_image = random.choice(images)
-        attr_path = os.path.join(species_dir, f"{os.path.splitext(chosen_image)[0]}.txt")
+        attr_path = attrs.get(os.path.splitext(chosen_image)[0])
         copyright_info = ""
-        if os.path.exists(attr_path):
+        if attr_path:
             with open(attr_path, 'r', encoding='utf-8') as f: copyright_info = f.read().strip()
         image_url = url_for('static', filename=os.path.join(os.path.basename(CACHE_DIRECTORY), species_folder_name, chosen_image).replace('\\', '/'))
         return {"image_url": image_url, "copyright": copyright_info}
     return None
 
+_SPECIES_LIST = {'mtime': None, 'list': []}
+
+def _get_species_list():
+    """Return the species list from SPECIES_FILE, loading it on first use or when it changes."""
+    try:
+        mtime = os.stat(SPECIES_FILE).st_mtime_ns
+    except OSError:
+        return []
+    if mtime != _SPECIES_LIST['mtime']:
+        _SPECIES_LIST.update(mtime=mtime, list=load_species_from_file(SPECIES_FILE))
+    return _SPECIES_LIST['list']
+
 def get_offline_fallback_data():
     print("[INFO] Loading data from local cache.")
-    species_list = load_species_from_file(SPECIES_FILE)
+    species_list = _get_species_list()
     if not species_list: return []
     fallback_data = []
     num_to_sample = min(len(species_list), 4)
@@ -280,7 +497,7 @@ def get_bird_data():
     api_url = urljoin(BASE_URL, API_ENDPOINT)
     params = {'limit': 50}
     try:
-        response = requests.get(api_url, headers=HEADERS, proxies=PROXIES, timeout=10, params=params)
+        response = SESSION.get(api_url, timeout=10, params=params)
         response.raise_for_status()
         detections = response.json()
         if not isinstance(detections, list) or not detections:
@@ -300,12 +517,14 @@ def get_bird_data():
         # Separate pinned and unpinned birds
         pinned_birds = []
         unpinned_birds = []
+        seen_pinned = set()
 
         for bird in all_parsed:
             if bird['name'] in active_pinned:
                 bird['is_pinned'] = True
-                if bird['name'] not in [b['name'] for b in pinned_birds]:
+                if bird['name'] not in seen_pinned:
                     pinned_birds.append(bird)
+                    seen_pinned.add(bird['name'])
             else:
                 bird['is_pinned'] = False
                 unpinned_birds.append(bird)
@@ -322,36 +541,34 @@ def get_bird_data():
         final_list = pinned_birds + unique_unpinned
         final_list = final_list[:4]
 
-        # Check image URLs for only these final 4 birds
-        for bird in final_list:
-            if bird.get('image_url'):
-                if not check_image_url_fast(bird['image_url']):
-                    cached_asset = get_cached_image(bird['name'])
-                    if cached_asset:
-                        bird['image_url'] = cached_asset['image_url']
-                        bird['copyright'] = cached_asset['copyright']
-            else:
-                # No image URL, use cache
+        # Check image URLs for only these final 4 birds, concurrently
+        image_ok = IMG_CHECK_POOL.map(
+            lambda b: bool(b.get('image_url')) and check_image_url_fast(b['image_url']), final_list)
+        for bird, ok in zip(final_list, image_ok):
+            if not ok:
+                # Missing or unreachable image URL, use cache
                 cached_asset = get_cached_image(bird['name'])
                 if cached_asset:
                     bird['image_url'] = cached_asset['image_url']
                     bird['copyright'] = cached_asset['copyright']
 
-        new_id = "-".join([f"{d['name']}_{d['time_raw']}" for d in final_list])
+        new_id = tuple((d['name'], d['time_raw']) for d in final_list)
 
+        now = datetime.now()
         if new_id == DETECTION_CACHE["id"]:
-            data_to_process = DETECTION_CACHE["raw_data"]
+            # Same detections as last time: only the relative time needs refreshing
+            display_data = DETECTION_CACHE["rendered"]
+            for bird in display_data:
+                bird['time_display'] = format_seconds_ago(parse_absolute_time_to_seconds_ago(bird['time_raw'], now))
         else:
-            DETECTION_CACHE["raw_data"] = final_list
+            display_data = []
+            for bird in final_list:
+                bird_display_copy = bird.copy()
+                bird_display_copy['time_display'] = format_seconds_ago(parse_absolute_time_to_seconds_ago(bird['time_raw'], now))
+                bird_display_copy['confidence'] = f"{bird['confidence_value']}%"
+                display_data.append(bird_display_copy)
+            DETECTION_CACHE["rendered"] = display_data
             DETECTION_CACHE["id"] = new_id
-            data_to_process = final_list
-
-        display_data = []
-        for bird in data_to_process:
-            bird_display_copy = bird.copy()
-            bird_display_copy['time_display'] = format_seconds_ago(parse_absolute_time_to_seconds_ago(bird['time_raw']))
-            bird_display_copy['confidence'] = f"{bird['confidence_value']}%"
-            display_data.append(bird_display_copy)
 
         return display_data, False
     except requests.exceptions.RequestException:
@@ -368,7 +585,7 @@ def index():
          with open(os.path.join('static', template_path), 'w') as f:
               f.write('<h1>Template file not found. Please create an index.html file.</h1>')
     refresh_interval = 30 if api_is_down else 5
-    server_url = f"http://{get_local_ip()}:8080"
+    server_url = SERVER_URL_TEMPLATE.format(get_local_ip())
     return render_template(
         template_path, birds=bird_data, refresh_interval=refresh_interval,
         api_is_down=api_is_down, server_url=server_url
@@ -379,19 +596,26 @@ def data():
     bird_data, api_is_down = get_bird_data()
     return jsonify({'birds': bird_data, 'api_is_down': api_is_down})
 
+# Last microphone status probe, reused for AUDIO_STATUS_TTL seconds
+_AUDIO_STATUS = {'url': None, 'ts': 0.0, 'body': None}
+
 @app.route('/audio_status')
 def audio_status():
     display_config = load_display_config()
     status_url = display_config.get('microphone_status_url', "http://10.42.0.50/api/status")
+    now = time.monotonic()
+    if status_url == _AUDIO_STATUS['url'] and now - _AUDIO_STATUS['ts'] < AUDIO_STATUS_TTL:
+        return json_body_response(_AUDIO_STATUS['body'])
     try:
-        response = requests.get(status_url, timeout=5)
+        response = SESSION.get(status_url, timeout=AUDIO_STATUS_TIMEOUT)
         response.raise_for_status()
         status_data = response.json()
         is_connected = status_data.get("streaming") is True
     except (requests.exceptions.RequestException, json.JSONDecodeError, KeyError):
         print("[INFO] Microphone status unavailable")
         is_connected = False
-    return jsonify({"connected": is_connected})
+    _AUDIO_STATUS.update(url=status_url, ts=now, body=json_dumps({"connected": is_connected}))
+    return json_body_response(_AUDIO_STATUS['body'])
 
 @app.route('/shutdown', methods=['POST'])
 def shutdown():
@@ -408,10 +632,17 @@ def shutdown():
 def set_brightness():
     try:
         brightness = request.json.get('brightness')
-        if brightness is not None and 0 <= int(brightness) <= 255:
-            command = f"echo {brightness} | sudo tee /sys/class/backlight/10-0045/brightness"
-            print(f"Executing brightness command: {command}")
-            os.system(command)
+        try:
+            value = int(brightness)
+        except (TypeError, ValueError):
+            value = None
+        if value is not None and 0 <= value <= 255:
+            print(f"Setting brightness to {value}")
+            if BRIGHTNESS_DIRECT:
+                with open(BRIGHTNESS_PATH, 'w') as f: f.write(str(value))
+            else:
+                subprocess.run(['sudo', 'tee', BRIGHTNESS_PATH], input=f"{value}\n", text=True,
+                               stdout=subprocess.DEVNULL, check=False)
             return jsonify({'status': 'success', 'brightness': brightness})
         return jsonify({'status': 'error', 'message': 'Invalid brightness value'}), 400
     except Exception as e:
@@ -421,26 +652,24 @@ def set_brightness():
 @app.route('/reboot', methods=['POST'])
 def reboot_system():
     print("Executing reboot command...")
-    os.system('sudo reboot')
+    subprocess.run(['sudo', 'reboot'], check=False)
     return jsonify({'status': 'rebooting'})
 
 @app.route('/poweroff', methods=['POST'])
 def poweroff_system():
     print("Executing power off command...")
-    os.system('sudo poweroff')
+    subprocess.run(['sudo', 'poweroff'], check=False)
     return jsonify({'status': 'shutting down'})
 
 @app.route('/api/pinned_species')
 def get_pinned_species():
     """Return list of currently pinned species with time remaining."""
     active_pinned = get_active_pinned_species()
-    now = datetime.now()
+    now_ts = time.time()
     result = []
 
     for species_name, data in active_pinned.items():
-        pinned_until = datetime.fromisoformat(data['pinned_until'])
-        time_remaining = pinned_until - now
-        hours_remaining = int(time_remaining.total_seconds() / 3600)
+        hours_remaining = int((data['pinned_until_ts'] - now_ts) / 3600)
 
         result.append({
             'name': species_name,
@@ -448,7 +677,7 @@ def get_pinned_species():
             'pinned_until': data['pinned_until']
         })
 
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/dismiss_pinned/<species_name>', methods=['POST'])
 def dismiss_pinned(species_name):
@@ -463,10 +692,11 @@ def dismiss_pinned(species_name):
 def dismiss_all_pinned():
     """Dismiss all pinned species."""
     try:
-        pinned = load_pinned_species()
-        for species_name in pinned:
-            pinned[species_name]['dismissed'] = True
-        save_pinned_species(pinned)
+        with _PINNED_LOCK:
+            pinned = load_pinned_species()
+            for species_name in pinned:
+                pinned[species_name]['dismissed'] = True
+            save_pinned_species(pinned)
         return jsonify({'status': 'success', 'message': 'All pinned species dismissed'})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -477,7 +707,11 @@ def dismiss_all_pinned():
 def get_display_config_api():
     """Get display configuration"""
     config = load_display_config()
-    return jsonify(config)
+    # Reuse the serialized body until the parsed config changes
+    key = _CONFIG_CACHE.get(DISPLAY_CONFIG_FILE, (None,))[0]
+    if key is None or key != _DISPLAY_CONFIG_JSON['key']:
+        _DISPLAY_CONFIG_JSON.update(key=key, body=json_dumps(config))
+    return json_body_response(_DISPLAY_CONFIG_JSON['body'])
 
 @app.route('/api/config/display', methods=['POST'])
 def update_display_config_api():
@@ -656,4 +890,10 @@ if __name__ == '__main__':
         sys.exit()
 
     print(f"Starting Flask server on http://0.0.0.0:{SERVER_PORT}")
-    app.run(host='0.0.0.0', port=SERVER_PORT)
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug's dev server, but at least handle requests concurrently
+        app.run(host='0.0.0.0', port=SERVER_PORT, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=SERVER_PORT, threads=8)
@@ -1,11 +1,23 @@
 import os
 import re
 import csv
+import json
+import sys
+import queue
+import itertools
+import logging
+import logging.handlers
+import sqlite3
+import time
+import zlib
 import requests
-from urllib.parse import urljoin, quote_plus
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin, quote_plus, urlsplit
 from PIL import Image
 from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import threading
 
 # --- Constants and Configuration ---
@@ -18,21 +30,123 @@ MIN_IMAGE_HEIGHT = 600
 MAX_WORKERS = 10  # Number of parallel download threads
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
 }
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')  # Image types the builder downloads and the displays serve
+MANIFEST_FILE = ".manifest.json"  # Per-species list of the image URLs/attributions last scraped
+PAGE_CACHE_PATH = os.path.join(os.path.dirname(SPECIES_FILE), ".wikimedia_meta.sqlite")  # Outside static/, so never served
+PAGE_CACHE_TTL = 30 * 24 * 3600  # Re-parse Wikimedia file pages after 30 days
+
+# Prefer the C-based lxml parser; fall back to the stdlib one if it isn't installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Patterns used while parsing Wikimedia pages, compiled once
+_DIM_RE = re.compile(r'([\d,]+)\s*×\s*([\d,]+)')  # "1,024 × 768 pixels"
+_AUTHOR_RE = re.compile(r'^\s*Author\s*$')
+_THUMB_RE = re.compile(r'/thumb(/[^?#]+)/[^/?#]+$')  # thumb URL -> original file URL
+
+# Worker output goes through this logger; during a build it is drained by one listener thread
+log = logging.getLogger('cache_builder')
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('%(message)s'))
+log.addHandler(_log_handler)
+
+@contextmanager
+def _queued_logging():
+    """Route log records through a queue so workers never block on stdout."""
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, _log_handler)
+    log.removeHandler(_log_handler)
+    log.addHandler(queue_handler)
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()  # flushes anything still queued
+        log.removeHandler(queue_handler)
+        log.addHandler(_log_handler)
 
-# Thread-safe print lock
-print_lock = threading.Lock()
-
-# Session will be created when needed
-_session = None
+# Each worker thread gets its own Session (requests.Session isn't fully thread-safe)
+_tls = threading.local()
 
 def get_session():
-    """Get or create a requests session for connection pooling."""
-    global _session
-    if _session is None:
-        _session = requests.Session()
-        _session.headers.update(HEADERS)
-    return _session
+    """Get or create this thread's requests session for connection pooling."""
+    session = getattr(_tls, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        # Keep-alive pool plus retries for transient Wikimedia errors
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2,
+                              max_retries=Retry(total=3, backoff_factor=0.3,
+                                                status_forcelist=[429, 500, 502, 503, 504]))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _tls.session = session
+    return session
+
+def get_page_cache():
+    """Get or open this thread's connection to the parsed file-page cache (None if unavailable)."""
+    if not hasattr(_tls, 'page_cache'):
+        try:
+            conn = sqlite3.connect(PAGE_CACHE_PATH, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS pages("
+                         "url TEXT PRIMARY KEY, optimal TEXT, attribution TEXT, ts INTEGER)")
+            conn.commit()
+        except sqlite3.Error as e:
+            log.warning(f"{YELLOW}[WARNING] Wikimedia page cache unavailable: {e}{NC}")
+            conn = None
+        _tls.page_cache = conn
+    return _tls.page_cache
+
+def get_cached_page(file_page_url):
+    """Return (optimal_url, attribution) for a recently parsed file page, or None."""
+    conn = get_page_cache()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT optimal, attribution FROM pages WHERE url = ? AND ts >= ?",
+                           (file_page_url, int(time.time()) - PAGE_CACHE_TTL)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row
+
+def store_cached_page(file_page_url, optimal_url, attribution):
+    """Remember the parse result of a file page."""
+    conn = get_page_cache()
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO pages(url, optimal, attribution, ts) VALUES (?, ?, ?, ?)",
+                         (file_page_url, optimal_url, attribution, int(time.time())))
+    except sqlite3.Error:
+        pass
+
+# At most this many requests to any one Wikimedia host at a time, across all threads
+WIKIMEDIA_PER_HOST_LIMIT = 8
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+def host_slot(url):
+    """Semaphore capping concurrent requests to the host of `url`."""
+    host = urlsplit(url).netloc
+    with _HOST_SLOTS_LOCK:
+        slot = _HOST_SLOTS.get(host)
+        if slot is None:
+            slot = _HOST_SLOTS[host] = threading.BoundedSemaphore(WIKIMEDIA_PER_HOST_LIMIT)
+    return slot
+
+# Shared pool for file-page fetches, so each species worker can have several requests in flight
+PAGE_FETCH_POOL = ThreadPoolExecutor(max_workers=WIKIMEDIA_PER_HOST_LIMIT)
 
 # Color codes for terminal output
 YELLOW = '\033[1;33m'
@@ -49,18 +163,20 @@ def format_author_name(author_str):
         return cleaned_author[:cut_off_point] + " ..." if cut_off_point != -1 else cleaned_author[:20] + " ..."
     return cleaned_author
 
+def _is_image_entry(entry):
+    """True for a DirEntry that is a cached image file."""
+    return entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file()
+
 def load_species_from_file(filename):
     """Loads a list of bird species from a CSV file (common_name, scientific_name)."""
-    if not os.path.exists(filename): return []
-    species_list = []
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
+        with open(filename, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f, dialect='excel')
             next(reader, None)
-            for row in reader:
-                if len(row) >= 2 and row[0] and row[1]:
-                    species_list.append((row[0].strip(), row[1].strip()))
-        return species_list
+            stripped = ((row[0].strip(), row[1].strip()) for row in reader if len(row) >= 2)
+            return [(common, scientific) for common, scientific in stripped if common and scientific]
+    except FileNotFoundError:
+        return []
     except (IOError, csv.Error) as e:
         print(f"Error reading or parsing species CSV file '{filename}': {e}")
         return []
@@ -175,83 +291,84 @@ def find_optimal_image_size(page_soup):
     if not resolution_span:
         return None
 
-    # Find all resolution links
-    resolution_links = resolution_span.find_all('a', class_='mw-thumbnail-link')
-    suitable_images = []
-
-    for link in resolution_links:
-        url = link.get('href', '')
-        text = link.get_text(strip=True)
-
+    # Resolutions are listed smallest first, so the first one that is big enough wins
+    for link in resolution_span.find_all('a', class_='mw-thumbnail-link'):
         # Parse dimensions like "1,024 × 1,024 pixels" or "768 × 768 pixels"
-        match = re.search(r'([\d,]+)\s*×\s*([\d,]+)', text)
-        if match:
-            width = int(match.group(1).replace(',', ''))
-            height = int(match.group(2).replace(',', ''))
-
-            # Check if meets minimum requirements
-            if width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT:
-                suitable_images.append({
-                    'url': url,
-                    'width': width,
-                    'height': height,
-                    'total_pixels': width * height
-                })
-
-    # Sort by total pixels (ascending) and return the smallest suitable one
-    if suitable_images:
-        suitable_images.sort(key=lambda x: x['total_pixels'])
-        return suitable_images[0]['url']
+        match = _DIM_RE.search(link.get_text(strip=True))
+        if not match:
+            continue
+        width = int(match.group(1).replace(',', ''))
+        height = int(match.group(2).replace(',', ''))
+
+        # Check if meets minimum requirements
+        if width >= MIN_IMAGE_WIDTH and height >= MIN_IMAGE_HEIGHT:
+            return link.get('href', '') or None
 
     return None
 
+def _parse_file_page(file_page_url):
+    """Fetch (or recall) a Wikimedia file page and return (optimal_url, attribution)."""
+    cached_page = get_cached_page(file_page_url)
+    if cached_page:
+        return cached_page
+
+    with host_slot(file_page_url):
+        page_response = get_session().get(file_page_url, timeout=10)
+    page_soup = BeautifulSoup(page_response.content, HTML_PARSER)
+
+    # Get attribution
+    attribution = "Wikimedia Commons"
+    author_header = page_soup.find('td', string=_AUTHOR_RE)
+    attribution_cell = author_header.find_next_sibling('td') if author_header else None
+    if attribution_cell:
+        attribution = attribution_cell.get_text(strip=True, separator=' ').split('(')[0].strip()
+    formatted_attribution = format_author_name(attribution)
+    final_attribution = f"© {formatted_attribution}" if formatted_attribution else "© Wikimedia Commons"
+
+    # Find optimal image size
+    optimal_url = find_optimal_image_size(page_soup)
+    if page_response.ok:
+        store_cached_page(file_page_url, optimal_url, final_attribution)
+    return optimal_url, final_attribution
+
 def _fetch_and_parse_wikimedia_search(search_query, num_images):
     """Helper function to perform a single search query on Wikimedia and parse results."""
     base_url = "https://commons.wikimedia.org"
     search_url = f"{base_url}/w/index.php?search={quote_plus(search_query)}&title=Special:MediaSearch&go=Go&type=image"
     try:
-        response = get_session().get(search_url)
+        with host_slot(search_url):
+            response = get_session().get(search_url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         result_elements = soup.select('a.sdms-image-result')
-        image_data = []
+        results = []
         for result_a_tag in list(dict.fromkeys(result_elements))[:num_images]:
             file_page_url = urljoin(base_url, result_a_tag.get('href', ''))
             img_tag = result_a_tag.find('img')
             if not file_page_url or not img_tag or not img_tag.get('data-src'): continue
+            # Fetch this species' file pages concurrently rather than one after another
+            results.append((img_tag['data-src'], PAGE_FETCH_POOL.submit(_parse_file_page, file_page_url)))
 
+        image_data = []
+        for thumbnail_url, future in results:
             try:
-                page_response = get_session().get(file_page_url, timeout=10)
-                page_soup = BeautifulSoup(page_response.text, 'html.parser')
-
-                # Get attribution
-                attribution = "Wikimedia Commons"
-                author_header = page_soup.find('td', string=re.compile(r'^\s*Author\s*$'))
-                if author_header and author_header.find_next_sibling('td'):
-                    attribution_cell = author_header.find_next_sibling('td')
-                    attribution = attribution_cell.get_text(strip=True, separator=' ').split('(')[0].strip()
-                formatted_attribution = format_author_name(attribution)
-                final_attribution = f"© {formatted_attribution}" if formatted_attribution else "© Wikimedia Commons"
-
-                # Find optimal image size
-                optimal_url = find_optimal_image_size(page_soup)
-                if optimal_url:
-                    # Make sure it's an absolute URL
-                    if optimal_url.startswith('//'):
-                        optimal_url = 'https:' + optimal_url
-                    elif optimal_url.startswith('/'):
-                        optimal_url = base_url + optimal_url
-                    image_data.append({'url': optimal_url, 'attribution': final_attribution})
-                else:
-                    # Fallback to full resolution if optimal size not found
-                    thumbnail_url = img_tag['data-src']
-                    full_res_url = thumbnail_url.replace('/thumb', '').rsplit('/', 1)[0]
-                    image_data.append({'url': full_res_url, 'attribution': final_attribution})
-
+                optimal_url, final_attribution = future.result()
             except requests.exceptions.RequestException: continue
+
+            if optimal_url:
+                # Make sure it's an absolute URL
+                if optimal_url.startswith('//'):
+                    optimal_url = 'https:' + optimal_url
+                elif optimal_url.startswith('/'):
+                    optimal_url = base_url + optimal_url
+                image_data.append({'url': optimal_url, 'attribution': final_attribution})
+            else:
+                # Fallback to full resolution if optimal size not found
+                full_res_url = _THUMB_RE.sub(r'\1', thumbnail_url)
+                image_data.append({'url': full_res_url, 'attribution': final_attribution})
         return image_data
     except requests.exceptions.RequestException as e:
-        print(f"Error scraping Wikimedia for query '{search_query}': {e}")
+        log.warning(f"Error scraping Wikimedia for query '{search_query}': {e}")
         return []
 
 def scrape_wikimedia_for_image_data(common_name, scientific_name, num_images):
@@ -263,51 +380,138 @@ def scrape_wikimedia_for_image_data(common_name, scientific_name, num_images):
     return []
 
 def download_image_and_attribution(image_info, folder_path, file_name_base):
-    """Downloads an image and saves its attribution, skipping if files already exist."""
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path, exist_ok=True)
-    file_ext = os.path.splitext(image_info['url'].split('(')[0])[-1] or ".jpg"
+    """Downloads an image and saves its attribution, skipping if files already exist. Returns success."""
+    file_ext = '.' + urlsplit(image_info['url']).path.rpartition('.')[2]
+    if file_ext.lower() not in IMAGE_EXTENSIONS:
+        log.warning(f"Skipping {file_name_base}: unsupported image type in {image_info['url']}")
+        return False
     image_file_path = os.path.join(folder_path, f"{file_name_base}{file_ext}")
     attr_file_path = os.path.join(folder_path, f"{file_name_base}.txt")
-    if os.path.exists(image_file_path) and os.path.exists(attr_file_path): return
+    if os.path.exists(image_file_path) and os.path.exists(attr_file_path): return True
+    part_file_path = image_file_path + '.part'
     try:
-        image_response = get_session().get(image_info['url'], timeout=15)
-        image_response.raise_for_status()
-        with open(image_file_path, 'wb') as f: f.write(image_response.content)
+        # Stream straight to disk instead of buffering whole originals in memory.
+        # Writes are one 64 KiB chunk per syscall and the crawl is network-bound, so plain
+        # blocking writes are kept rather than batching them through io_uring.
+        with host_slot(image_info['url']), \
+                get_session().get(image_info['url'], timeout=15, stream=True) as image_response:
+            image_response.raise_for_status()
+            with open(part_file_path, 'wb') as f:
+                for chunk in image_response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        # Only a complete download ever appears under the image name
+        os.replace(part_file_path, image_file_path)
         with open(attr_file_path, 'w', encoding='utf-8') as f: f.write(image_info['attribution'])
-        with print_lock:
-            print(f"Successfully cached {os.path.basename(image_file_path)}")
+        log.info(f"Successfully cached {os.path.basename(image_file_path)}")
+        return True
     except (requests.exceptions.RequestException, IOError) as e:
-        with print_lock:
-            print(f"Failed to download/save for {file_name_base}. Error: {e}")
+        try:
+            os.remove(part_file_path)
+        except OSError:
+            pass
+        log.warning(f"Failed to download/save for {file_name_base}. Error: {e}")
+        return False
 
 # --- Main Cache Building Process ---
+class _FolderNameTable(dict):
+    """str.translate table keeping alphanumerics, spaces and underscores; ASCII prefilled, the rest on demand."""
+    def __init__(self):
+        super().__init__((codepoint, self._keep(codepoint)) for codepoint in range(128))
+
+    @staticmethod
+    def _keep(codepoint):
+        char = chr(codepoint)
+        return char if char.isalnum() or char in ' _' else None
+
+    def __missing__(self, codepoint):
+        self[codepoint] = self._keep(codepoint)
+        return self[codepoint]
+
+_FOLDER_NAME_TABLE = _FolderNameTable()
+
+def species_folder_name_for(common_name):
+    """Cache folder name for a species' common name."""
+    return common_name.translate(_FOLDER_NAME_TABLE).rstrip().replace(' ', '_')
+
+def count_cached_images():
+    """Map each species folder in the cache to its number of image files, in one scandir pass."""
+    counts = {}
+    try:
+        with os.scandir(CACHE_DIRECTORY) as species_dirs:
+            for species_dir in species_dirs:
+                if species_dir.is_dir():
+                    with os.scandir(species_dir.path) as entries:
+                        counts[species_dir.name] = sum(1 for entry in entries if _is_image_entry(entry))
+    except FileNotFoundError:
+        pass
+    return counts
+
+def load_manifest(species_folder_path):
+    """Return the image infos recorded for a species folder, or None."""
+    try:
+        with open(os.path.join(species_folder_path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            image_infos = json.load(f)
+    except (FileNotFoundError, NotADirectoryError, ValueError):
+        return None
+    return image_infos if isinstance(image_infos, list) else None
+
+def save_manifest(species_folder_path, image_infos):
+    """Record the scraped image infos for a species folder."""
+    manifest_path = os.path.join(species_folder_path, MANIFEST_FILE)
+    try:
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(image_infos, f)
+        os.replace(manifest_path + '.tmp', manifest_path)
+    except OSError as e:
+        log.warning(f"Could not write manifest for {os.path.basename(species_folder_path)}. Error: {e}")
+
 def process_species(species_info):
     """Process a single species - fetch and download images."""
     common_name, scientific_name = species_info
-    species_folder_name = "".join(c for c in common_name if c.isalnum() or c in ' _').rstrip().replace(' ', '_')
+    species_folder_name = species_folder_name_for(common_name)
     species_folder_path = os.path.join(CACHE_DIRECTORY, species_folder_name)
 
     # Check if already cached
-    if os.path.isdir(species_folder_path):
-        images_found = len([f for f in os.listdir(species_folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg'))])
-        if images_found >= IMAGES_PER_SPECIES:
-            with print_lock:
-                print(f"✓ Cache for '{common_name}' is already complete ({images_found} images). Skipping.")
+    try:
+        with os.scandir(species_folder_path) as entries:
+            images_found = sum(1 for entry in entries if _is_image_entry(entry))
+    except (FileNotFoundError, NotADirectoryError):
+        images_found = 0
+    if images_found >= IMAGES_PER_SPECIES:
+        log.info(f"✓ Cache for '{common_name}' is already complete ({images_found} images). Skipping.")
+        return common_name, True
+    os.makedirs(species_folder_path, exist_ok=True)
+
+    # Re-fetch missing images straight from the URLs of the last crawl, without touching Wikimedia's HTML
+    manifest = load_manifest(species_folder_path)
+    if manifest and len(manifest) >= IMAGES_PER_SPECIES:
+        results = [download_image_and_attribution(info, species_folder_path, f"{species_folder_name}_{i+1}")
+                   for i, info in enumerate(manifest)]
+        if all(results):
             return common_name, True
 
     # Fetch and download images
     image_infos = scrape_wikimedia_for_image_data(common_name, scientific_name, IMAGES_PER_SPECIES)
     if not image_infos:
-        with print_lock:
-            print(f"✗ No images found for '{common_name}'")
+        log.info(f"✗ No images found for '{common_name}'")
         return common_name, False
 
     for i, info in enumerate(image_infos):
         download_image_and_attribution(info, species_folder_path, f"{species_folder_name}_{i+1}")
+    save_manifest(species_folder_path, image_infos)
 
     return common_name, True
 
+def _process_chunk(species_chunk, on_completed):
+    """Process one worker's species sequentially on the same thread (and thus the same Session)."""
+    for species in species_chunk:
+        # One bad species must not take the rest of this worker's bucket down with it
+        try:
+            process_species(species)
+        except Exception as e:
+            log.warning(f"✗ Failed to process '{species[0]}'. Error: {e}")
+        on_completed(species[0])
+
 def ensure_cache_is_built():
     """Checks for and builds the offline image cache with parallel processing."""
     print("--- Checking local image cache... ---")
@@ -316,51 +520,88 @@ def ensure_cache_is_built():
         print(f"WARNING: '{SPECIES_FILE}' not found or empty. Cannot build cache.")
         return
 
+    # Skip species whose folders are already complete without touching the executor
+    cached_counts = count_cached_images()
+    pending_species = [species for species in bird_species_to_cache
+                       if cached_counts.get(species_folder_name_for(species[0]), 0) < IMAGES_PER_SPECIES]
+    already_cached = len(bird_species_to_cache) - len(pending_species)
+    if already_cached:
+        print(f"✓ {already_cached} species already fully cached. Skipping.")
+    bird_species_to_cache = pending_species
+
     total_species = len(bird_species_to_cache)
     print(f"Processing {total_species} species with {MAX_WORKERS} parallel workers...")
 
-    completed = 0
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all tasks
-        future_to_species = {executor.submit(process_species, species): species for species in bird_species_to_cache}
+    # Give each worker a stable bucket of species so it keeps reusing its own keep-alive connections
+    chunks = [[] for _ in range(MAX_WORKERS)]
+    for species in bird_species_to_cache:
+        chunks[zlib.crc32(species[0].encode('utf-8')) % MAX_WORKERS].append(species)
+
+    completed = itertools.count(1)
+    def report_completed(species_name):
+        log.info(f"[{next(completed)}/{total_species}] Completed: {species_name}")
 
-        # Process completed tasks
-        for future in as_completed(future_to_species):
-            species_name, success = future.result()
-            completed += 1
-            with print_lock:
-                print(f"[{completed}/{total_species}] Completed: {species_name}")
+    with _queued_logging(), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(_process_chunk, chunk, report_completed) for chunk in chunks if chunk]
+        for future in as_completed(futures):
+            future.result()
 
     print("--- Image cache check complete. ---")
 
+def _resize_one(image_path, target_width, target_height):
+    """Downscale a single cached image to fill the target size; runs in a worker process."""
+    file = os.path.basename(image_path)
+    try:
+        with Image.open(image_path) as img:
+            # Let the JPEG decoder scale down at DCT time (no-op for PNG)
+            img.draft('RGB', (target_width * 2, target_height * 2))
+            w, h = img.size
+
+            # Skip if already at or below target size
+            if w <= target_width and h <= target_height:
+                return
+
+            # Calculate scale to FILL the screen (use max instead of min)
+            # This ensures at least one dimension meets the target
+            scale = max(target_width / w, target_height / h)
+            new_width = int(w * scale)
+            new_height = int(h * scale)
+
+            print(f"Downscaling {file} from {w}x{h} to {new_width}x{new_height}...")
+            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            if image_path.lower().endswith(('.jpg', '.jpeg')):
+                # Progressive/optimized JPEG is ~30-50% smaller at no visible cost on an 800x600 screen
+                resized_img = resized_img.convert('RGB')
+                resized_img.save(image_path, format='JPEG', quality=82, optimize=True,
+                                 progressive=True, subsampling=2)
+            else:
+                resized_img.save(image_path, optimize=True)
+    except Exception as e:
+        print(f"Could not resize {image_path}. Error: {e}")
+
 def resize_cached_images():
     """Resizes large images to fill the target screen size while maintaining aspect ratio."""
     print("--- Checking and resizing large cached images... ---")
     target_width = 800
     target_height = 600
-    for root, _, files in os.walk(CACHE_DIRECTORY):
-        for file in files:
-            if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                image_path = os.path.join(root, file)
-                try:
-                    with Image.open(image_path) as img:
-                        w, h = img.size
-
-                        # Skip if already at or below target size
-                        if w <= target_width and h <= target_height:
-                            continue
-
-                        # Calculate scale to FILL the screen (use max instead of min)
-                        # This ensures at least one dimension meets the target
-                        scale = max(target_width / w, target_height / h)
-                        new_width = int(w * scale)
-                        new_height = int(h * scale)
-
-                        print(f"Downscaling {file} from {w}x{h} to {new_width}x{new_height}...")
-                        resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        resized_img.save(image_path)
-                except Exception as e:
-                    print(f"Could not resize {image_path}. Error: {e}")
+    # Cache layout is one level deep: CACHE_DIRECTORY/<species>/<file>
+    image_paths = []
+    try:
+        with os.scandir(CACHE_DIRECTORY) as species_dirs:
+            for species_dir in species_dirs:
+                if species_dir.is_dir():
+                    with os.scandir(species_dir.path) as entries:
+                        image_paths.extend(entry.path for entry in entries if _is_image_entry(entry))
+    except FileNotFoundError:
+        pass
+
+    # Decoding and LANCZOS resampling are CPU-bound, so spread them across cores.
+    # `pip install pillow-simd` (drop-in Pillow replacement) speeds up resize further with SSE4/AVX2.
+    if image_paths:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(_resize_one, image_paths,
+                              [target_width] * len(image_paths), [target_height] * len(image_paths),
+                              chunksize=8))
     print("--- Image resizing complete. ---")
 
 # This allows the script to be run directly from the command line